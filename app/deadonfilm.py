@@ -1,8 +1,12 @@
 import imdb
-import json
+import orjson
 import os
 import logging
+import threading
+import time
 
+from collections import OrderedDict
+from contextlib import contextmanager
 from urllib.parse import urlparse
 
 from flask import (
@@ -14,22 +18,90 @@ from flask import (
     render_template
 )
 import psycopg2.extras
+import psycopg2.pool
 
 url = urlparse(os.environ.get('IMDB_DB'))
 insecure_redirect = os.environ.get('SECURE_REDIRECT_URL', False)
 
 app = Flask(__name__, root_path='./')
-i = imdb.IMDb()
+_imdb = None
 
-conn = psycopg2.connect(
+pool = psycopg2.pool.ThreadedConnectionPool(
+    1, 32,
     database=url.path[1:],
     user=url.username,
     password=url.password,
     host=url.hostname,
     port=url.port
 )
-conn.autocommit = True
-cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+
+# One array parameter instead of an ``IN`` list keeps the statement text the
+# same whatever the cast size (and still works for an empty cast).
+DEAD_CAST_SQL = """SELECT
+                person_id, birth_year, death_year, primary_name
+                from name_basics WHERE
+                person_id = ANY(%s::integer[]) AND
+                death_year NOTNULL
+                """
+CAST_CACHE_SECONDS = 24 * 60 * 60
+CAST_CACHE_SIZE = 1024
+
+# movie id -> (time fetched, cast), least recently used first
+_casts = OrderedDict()
+_casts_lock = threading.Lock()
+
+
+def imdb_client():
+    """
+    The shared IMDb access object, created on first use rather than at import
+    so workers start without paying for it.
+    """
+    global _imdb
+    if _imdb is None:
+        _imdb = imdb.IMDb()
+    return _imdb
+
+
+@contextmanager
+def db_cursor():
+    """
+    Cursor on a connection borrowed from ``pool`` for the ``with`` block, so
+    concurrent requests never share one connection.
+    """
+    conn = pool.getconn()
+    try:
+        conn.autocommit = True
+        with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
+            yield cursor
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def get_cast(movie_id):
+    """
+    Characters of the movie with the given IMDb id, by person id, or ``None``
+    if there is no such movie. Scraping the full credits is the slow part of
+    ``/died/``, so each worker keeps a movie's cast for
+    ``CAST_CACHE_SECONDS`` after fetching it.
+    """
+    now = time.monotonic()
+    with _casts_lock:
+        cached = _casts.get(movie_id)
+        if cached is not None and now - cached[0] < CAST_CACHE_SECONDS:
+            _casts.move_to_end(movie_id)
+            return cached[1]
+
+    movie = imdb_client().get_movie(movie_id, info=["full credits"])
+    if movie is None:
+        return None
+    cast = {int(actor.getID()): str(actor.currentRole)
+            for actor in movie.data['cast']}
+    with _casts_lock:
+        _casts[movie_id] = (now, cast)
+        _casts.move_to_end(movie_id)
+        while len(_casts) > CAST_CACHE_SIZE:
+            _casts.popitem(last=False)
+    return cast
 
 
 @app.before_first_request
@@ -54,8 +126,8 @@ def search():
     """
     app.logger.info('Searching for %s' % request.args.get('q'))
     movie = request.args.get('q')
-    m = i.search_movie(movie)
-    resp = make_response(json.dumps(
+    m = imdb_client().search_movie(movie)
+    resp = make_response(orjson.dumps(
         [{
             'value': mt['long imdb title'],
             'id': mt.getID()
@@ -71,32 +143,24 @@ def died():
     Who died from the movie with the given IMDb id?
     """
     movie_id = request.form['id']
-    movie = i.get_movie(movie_id, info=["full credits"])
-    if movie is None:
+    cast = get_cast(movie_id)
+    if cast is None:
         resp = make_response("Movie not found: {}".format(movie_id, 404))
     else:
-        actors = movie.data['cast']
-        actors_by_id = {}
-        for actor in actors:
-            actors_by_id[int(actor.getID())] = actor
-        cursor.execute("""SELECT 
-                          * from name_basics WHERE 
-                          person_id IN %s AND 
-                          death_year NOTNULL
-                          """, (tuple(actors_by_id.keys()),))
+        with db_cursor() as cursor:
+            cursor.execute(DEAD_CAST_SQL, (list(cast),))
+            people = cursor.fetchall()
         pastos = []
-        for person in cursor.fetchall():
-            person_id = person['person_id']
-            character = str(actors_by_id[person_id].currentRole)
+        for person in people:
             pastos.append({
                 'person_id': person['person_id'],
                 'birth': person['birth_year'],
                 'death': person['death_year'],
-                'character': character,
+                'character': cast[person['person_id']],
                 'name': person['primary_name']
             })
         pastos = sorted(pastos, key=lambda pasto: pasto['death'], reverse=True)
-        resp = make_response(json.dumps(pastos))
+        resp = make_response(orjson.dumps(pastos))
         resp.headers['Content-Type'] = 'application/json'
         resp.headers['Access-Control-Allow-Origin'] = '*'
     return resp
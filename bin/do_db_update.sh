@@ -1,4 +1,3 @@
 #!/usr/bin/env bash
-# This dumps all the downloaded files into `imdb_tmp`
-./download_db.sh
-s32imdbpy.py imdb_tmp/ -u postgres://chris@localhost/imdb
\ No newline at end of file
+# This streams name.basics.tsv.gz straight from IMDb into the database
+IMDB_DB=${IMDB_DB:-postgres://chris@localhost/imdb} ./fill_db.py